@@ -66,70 +66,92 @@
     This may be unnecessary, assuming that the Z21 will not send any incorrect messages
     And no errors are made during the handling of incoming messages in this library.
     Variables are used to keep the functions readable and match the specifications.
-    They only exist within the context of the functions. No global variables are used.
+    They only exist within the context of the functions. No global variables are used,
+    apart from constants such as the precomputed fixed records.
     Also, the variables once created, are never mutated.
     Comments beyond reference of the functions to the specifications,
     are limited to a minumum.
+    Requires Python 3.10 or later.
 """
 
+import operator
+import struct
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Final
+
+# Receive functions return slotted dataclass instances, identified by their message.
+# Use dataclasses.asdict to get the fields as a dict.
+
+@dataclass(slots = True, frozen = True)
+class RecordError:
+    message: str = field(default = "record error", init = False)
+
+# Returned by all receive functions for an incorrect record; frozen, so it can be shared
+RECORD_ERROR = RecordError()
+
+_HDR_S = struct.Struct("<HH") # dataLen, header
+_DATA8_S = struct.Struct("<HHB") # dataLen, header, 8 bit data
+_DATA32_S = struct.Struct("<HHI") # dataLen, header, 32 bit data
+_X_DB0_S = struct.Struct("<HH3B") # dataLen, header, X-Header, DB0, XOR
+_X_DB1_S = struct.Struct("<HH4B") # dataLen, header, X-Header, DB0 - DB1, XOR
+_X_DB2_S = struct.Struct("<HH5B") # dataLen, header, X-Header, DB0 - DB2, XOR
+
 def bcdNibbles(db):
     highNibble = db >> 4
     lowNibble = db & 0b1111
     return highNibble, lowNibble
+
+_BCD = tuple(bcdNibbles(db) for db in range(256))
+
+def xorChecksum(data): # X-Header and data bytes, as bytes or any iterable of ints
+    return reduce(operator.xor, data, 0)
+
+def verifyChecksum(record): # X-Bus record, including its XOR byte
+    return xorChecksum(record[4:]) == 0
     
+LAN_GET_SERIAL_NUMBER: Final[bytes] = b"\x04\x00\x10\x00" # dataLen 0x0004, header 0x0010
+
 def sendLanGetSerialNumber(): # 2.1 LAN_GET_SERIAL_NUMBER
-    dataLen = 0x0004
-    header = 0x0010
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little")
+    return LAN_GET_SERIAL_NUMBER
+
+@dataclass(slots = True)
+class SerialNumber: # 2.1 LAN_GET_SERIAL_NUMBER
+    message: str = field(default = "LAN_GET_SERIAL_NUMBER", init = False)
+    serialNumber: int
 
 def receiveLanGetSerialNumber(record): # 2.1 LAN_GET_SERIAL_NUMBER
     if len(record) != 0x0008:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
+    dataLen, header, serialNumber = _DATA32_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0008 and \
         header == 0x0010
-    data = record[4:]
-    serialNumber = int.from_bytes(data, byteorder = "little")
     return \
-        { "Message": "LAN_GET_SERIAL_NUMBER",
-          "Serial Number": serialNumber } if correctRecord else \
-        { "record error" }
+        SerialNumber(serialNumber) if correctRecord else \
+        RECORD_ERROR
+
+LAN_LOGOFF: Final[bytes] = b"\x04\x00\x30\x00" # dataLen 0x0004, header 0x0030
 
 def sendLanLogoff(): # 2.2 LAN_LOGOFF
-    dataLen = 0x0004
-    header = 0x0030
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little")
+    return LAN_LOGOFF
+
+LAN_X_GET_VERSION: Final[bytes] = b"\x07\x00\x40\x00\x21\x21\x00" # dataLen 0x0007, header 0x0040, X-Header 0x21, DB0 0x21, XOR 0x00
 
 def sendLanXGetVersion(): # 2.3 LAN_X_GET_VERSION
-    dataLen = 0x0007
-    header = 0x0040
-    xHeader = 0x21
-    db0 = 0x21
-    xor = 0x00 # xHeader ^ db0
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    return LAN_X_GET_VERSION
+
+@dataclass(slots = True)
+class XBusVersion: # 2.3 LAN_X_GET_VERSION
+    message: str = field(default = "LAN_X_GET_VERSION", init = False)
+    majVersion: int
+    minVersion: int
+    commandStationId: str
 
 def receiveLanXGetVersion(record): # 2.3 LAN_X_GET_VERSION
     if len(record) != 0x0009:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
-    data = record[4:]
-    xHeader = data[0]
-    db0 = data[1]
-    db1 = data[2]
-    db2 = data[3]
-    xor = data[4]
+    dataLen, header, xHeader, db0, db1, db2, xor = _X_DB2_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0009 and \
         header == 0x0040 and \
@@ -137,56 +159,41 @@ def receiveLanXGetVersion(record): # 2.3 LAN_X_GET_VERSION
         db0 == 0x21 and \
         xor == xHeader ^ db0 ^ db1 ^ db2
     # BCD format: 0x36 --> version 3.6
-    majVersion, minVersion = bcdNibbles(db1)
+    majVersion, minVersion = _BCD[db1]
     commandStationId = \
         "Z21" if db2 == 0x12 else \
         "z21" if db2 == 0x13 else \
         "unknown"
     return \
-        { "Message": "LAN_X_GET_VERSION",
-          "X-Bus major version": majVersion,
-          "X-Bus minor version": minVersion,
-          "Command station ID": commandStationId } if correctRecord else \
-        { "record error" }
+        XBusVersion(majVersion, minVersion, commandStationId) if correctRecord else \
+        RECORD_ERROR
+
+LAN_X_GET_STATUS: Final[bytes] = b"\x07\x00\x40\x00\x21\x24\x05" # dataLen 0x0007, header 0x0040, X-Header 0x21, DB0 0x24, XOR 0x05
 
 def sendLanXGetStatus(): # 2.4 LAN_X_GET_STATUS
-    dataLen = 0x0007
-    header = 0x0040
-    xHeader = 0x21
-    db0 = 0x24
-    xor = 0x05  # xHeader ^ db0
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    return LAN_X_GET_STATUS
+
+LAN_X_SET_TRACK_POWER_OFF: Final[bytes] = b"\x07\x00\x40\x00\x21\x80\xA1" # dataLen 0x0007, header 0x0040, X-Header 0x21, DB0 0x80, XOR 0xA1
 
 def sendLanXSetTrackPowerOff(): # 2.5 LAN_X_SET_TRACK_POWER_OFF
-    dataLen = 0x0007
-    header = 0x0040
-    xHeader = 0x21
-    db0 = 0x80
-    xor = 0xA1 # xHeader ^ db0
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    return LAN_X_SET_TRACK_POWER_OFF
+
+LAN_X_SET_TRACK_POWER_ON: Final[bytes] = b"\x07\x00\x40\x00\x21\x81\xA0" # dataLen 0x0007, header 0x0040, X-Header 0x21, DB0 0x81, XOR 0xA0
 
 def sendLanXSetTrackPowerOn(): # 2.6 LAN_X_SET_TRACK_POWER_ON
-    dataLen = 0x0007
-    header = 0x0040
-    xHeader = 0x21
-    db0 = 0x81
-    xor = 0xA0 # xHeader ^ db0
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    return LAN_X_SET_TRACK_POWER_ON
+
+_LAN_X_BC_MESSAGES = {
+    0x00: "LAN_X_BC_TRACK_POWER_OFF",
+    0x01: "LAN_X_BC_TRACK_POWER_ON",
+    0x02: "LAN_X_BC_PROGRAMMING_MODE",
+    0x08: "LAN_X_BC_TRACK_SHORT_CIRCUIT",
+    0x82: "LAN_X_UNKNOWN_COMMAND"
+}
+
+@dataclass(slots = True)
+class XBroadcast: # 2.7 - 2.11
+    message: str
 
 def receiveLanXBc(record):  # 2.7 LAN_X_BC_TRACK_POWER_OFF
                             # 2.8 LAN_X_BC_TRACK_POWER_ON
@@ -195,75 +202,59 @@ def receiveLanXBc(record):  # 2.7 LAN_X_BC_TRACK_POWER_OFF
                             # 2.11 LAN_X_UNKNOWN_COMMAND
     if len(record) != 0x0007:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
-    data = record[4:]
-    xHeader = data[0]
-    db0 = data[1]
-    xor = data[2]
+    dataLen, header, xHeader, db0, xor = _X_DB0_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0007 and \
         header == 0x0040 and \
         xHeader == 0x61 and \
         xor == xHeader ^ db0
-    message = \
-        "LAN_X_BC_TRACK_POWER_OFF" if db0 == 0x00 else \
-        "LAN_X_BC_TRACK_POWER_ON" if db0 == 0x01 else \
-        "LAN_X_BC_PROGRAMMING_MODE" if db0 == 0x02 else \
-        "LAN_X_BC_TRACK_SHORT_CIRCUIT" if db0 == 0x08 else \
-        "LAN_X_UNKNOWN_COMMAND" if db == 0x82 else \
-        "unknown"
+    message = _LAN_X_BC_MESSAGES.get(db0, "unknown")
     return  \
-        { "Message": message } if correctRecord else \
-        { "record error" }
+        XBroadcast(message) if correctRecord else \
+        RECORD_ERROR
+
+_CENTRAL_STATES = {
+    0x01: "Emergency Stop",
+    0x02: "Track Voltage Off",
+    0x04: "Short Circuit",
+    0x20: "Programming Mode Active"
+}
+
+@dataclass(slots = True)
+class StatusChanged: # 2.12 LAN_X_STATUS_CHANGED
+    message: str = field(default = "LAN_X_STATUS_CHANGED", init = False)
+    status: str
 
 def receiveLanXStatusChanged(record): # 2.12 LAN_X_STATUS_CHANGED
     if len(record) != 0x0008:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
-    data = record[4:]
-    xHeader = data[0]
-    db0 = data[1]
-    db1 = data[2]
-    xor = data[3]
+    dataLen, header, xHeader, db0, db1, xor = _X_DB1_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0008 and \
         header == 0x0040 and \
         xHeader == 0x62 and \
         db0 == 0x22 and \
         xor == xHeader ^ db0 ^ db1
-    status = \
-        "Emergency Stop" if db1 & 0x01 else \
-        "Track Voltage Off" if db1 & 0x02 else \
-        "Short Circuit" if db1 & 0x04 else \
-        "Programming Mode Active" if db1 & 0x20 else \
-        "unknown"
+    # Several status bits may be set; the lowest one takes precedence
+    stateBits = db1 & 0x27
+    status = _CENTRAL_STATES.get(stateBits & -stateBits, "unknown")
     return \
-        { "Message": "LAN_X_STATUS_CHANGED",
-          "Status": status } if correctRecord else \
-        { "record error" }
+        StatusChanged(status) if correctRecord else \
+        RECORD_ERROR
+
+LAN_X_SET_STOP: Final[bytes] = b"\x06\x00\x40\x00\x80\x80" # dataLen 0x0006, header 0x0040, X-Header 0x80, XOR 0x80
 
 def sendLanXSetStop(): # 2.13 LAN_X_SET_STOP
-    dataLen = 0x0006
-    header = 0x0040
-    xHeader = 0x80
-    xor = 0x80 # xHeader ^ db0
-    return \
-        int.to_bytes(dataLen, 2, byteorder = 'little') + \
-        int.to_bytes(header, 2, byteorder = 'little') + \
-        int.to_bytes(xHeader, 1, byteorder = 'little') + \
-        int.to_bytes(xor, 1, byteorder = 'little')
+    return LAN_X_SET_STOP
+
+@dataclass(slots = True)
+class Stopped: # 2.14 LAN_X_BC_STOPPED
+    message: str = field(default = "LAN_X_BC_STOPPED", init = False)
 
 def receiveLanXBcStopped(record): # 2.14 LAN_X_BC_STOPPED
     if len(record) != 0x0007:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
-    data = record[4:]
-    xHeader = int.from_bytes(data[0:1], byteorder = "little")
-    db0 = int.from_bytes(data[1:2], byteorder = "little")
-    xor = int.from_bytes(data[2:3], byteorder = "little")
+    dataLen, header, xHeader, db0, xor = _X_DB0_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0007 and \
         header == 0x0040 and \
@@ -271,193 +262,192 @@ def receiveLanXBcStopped(record): # 2.14 LAN_X_BC_STOPPED
         db0 == 0x00 and \
         xor == 0x81 # xHeader ^ db0
     return \
-        { "Message": "LAN_X_BC_STOPPED" } if correctRecord else \
-        { "record error" }
+        Stopped() if correctRecord else \
+        RECORD_ERROR
+
+LAN_X_GET_FIRMWARE_VERSION: Final[bytes] = b"\x07\x00\x40\x00\xF1\x0A\xFB" # dataLen 0x0007, header 0x0040, X-Header 0xF1, DB0 0x0A, XOR 0xFB
 
 def sendLanXGetFirmwareVersion(): # 2.15 LAN_X_GET_FIRMWARE_VERSION
-    dataLen = 0x0007
-    header = 0x0040
-    xHeader = 0xF1
-    db0 = 0x0A
-    xor = 0xFB  # xHeader ^ db0
-    return \
-        int.to_bytes(dataLen, 2, byteorder = 'little') + \
-        int.to_bytes(header, 2, byteorder = 'little') + \
-        int.to_bytes(xHeader, 1, byteorder = 'little') + \
-        int.to_bytes(db0, 1, byteorder = 'little') + \
-        int.to_bytes(xor, 1, byteorder = 'little')
+    return LAN_X_GET_FIRMWARE_VERSION
+
+@dataclass(slots = True)
+class FirmwareVersion: # 2.15 LAN_X_GET_FIRMWARE_VERSION
+    message: str = field(default = "LAN_X_GET_FIRMWARE_VERSION", init = False)
+    majVersion: int
+    minVersion: int
 
 def receiveLanXGetFirmwareVersion(record): # 2.15 LAN_X_GET_FIRMWARE_VERSION
     if len(record) != 0x0009:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
-    data = record[4:]
-    xHeader = data[0]
-    db0 = data[1]
-    db1 = data[2]
-    db2 = data[3]
-    xor = data[4]
+    dataLen, header, xHeader, db0, db1, db2, xor = _X_DB2_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0009 and \
         header == 0x0040 and \
         xHeader == 0xF3 and \
         db0 == 0x0A and \
         xor == xHeader ^ db0 ^ db1 ^ db2
-    db1H, db1L = bcdNibbles(db1)
-    db2H, db2L = bcdNibbles(db2)
+    db1H, db1L = _BCD[db1]
+    db2H, db2L = _BCD[db2]
     majVersion = 10 * db1H + db1L
     minVersion = 10 * db2H + db2L
     return \
-        { "Message": "LAN_X_GET_FIRMWARE_VERSION",
-          "Major version": majVersion,
-          "Minor version": minVersion } if correctRecord else \
-        { "record error" }
+        FirmwareVersion(majVersion, minVersion) if correctRecord else \
+        RECORD_ERROR
+
+LAN_SET_BROADCASTFLAGS: Final[bytes] = b"\x08\x00\x50\x00\x01\x01\x01\x00" # dataLen 0x0008, header 0x0050, data 0x00010101
 
 def sendLanSetBroadcastflags(): # 2.16 LAN_SET_BROADCASTFLAGS
     # Note: this function subscribes to all messages suitable for automated driving.
     # Hence the data bytes are fixed rather than based on input parameters.
-    dataLen = 0x0008
-    header = 0x0050
-    data = 0x00010101
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(data, 4, byteorder = "little")
+    return LAN_SET_BROADCASTFLAGS
+
+LAN_GET_BROADCASTFLAGS: Final[bytes] = b"\x04\x00\x51\x00" # dataLen 0x0004, header 0x0051
 
 def sendLanGetBroadcastflags(): # 2.17 LAN_GET_BROADCASTFLAGS
-    dataLen = 0x0004
-    header = 0x0051
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little")
+    return LAN_GET_BROADCASTFLAGS
+
+@dataclass(slots = True)
+class BroadcastFlags: # 2.17 LAN_GET_BROADCASTFLAGS
+    message: str = field(default = "LAN_GET_BROADCASTFLAGS", init = False)
+    broadcastFlags: int
 
 def receiveLanGetBroadcastflags(record): # 2.17 LAN_GET_BROADCASTFLAGS
     if len(record) != 0x0008:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
+    dataLen, header, broadcastFlags = _DATA32_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0008 and \
         header == 0x0051
-    data = record[4:]
-    broadcastFlags = int.from_bytes(data, byteorder = "little")
     return \
-        { "Message": "LAN_GET_BROADCASTFLAGS",
-          "Broadcast Flags": broadcastFlags } if correctRecord else \
-        { "record error" }
+        BroadcastFlags(broadcastFlags) if correctRecord else \
+        RECORD_ERROR
+
+_LAN_SYSTEMSTATE_DATACHANGED_S = struct.Struct("<HH6H2B")
+
+@dataclass(slots = True)
+class SystemState: # 2.18 LAN_SYSTEMSTATE_DATACHANGED
+    message: str = field(default = "LAN_SYSTEMSTATE_DATACHANGED", init = False)
+    mainCurrent: int
+    progCurrent: int
+    temp: int
+    supplyVoltage: int
+    vccVoltage: int
+    csEmergencyStop: int
+    csTrackVoltageOff: int
+    csShortCircuit: int
+    csProgrammingModeActive: int
+    cseHighTemperature: int
+    csePowerLost: int
+    cseShortCircuitExternal: int
+    cseShortCircuitInternal: int
 
 def receiveLanSystemstateDatachanged(record): # 2.18 LAN_SYSTEMSTATE_DATACHANGED
     if len(record) != 0x0014:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
+    dataLen, header, \
+        mainCurrent, progCurrent, filteredMainCurrent, temp, supplyVoltage, vccVoltage, \
+        centralState, centralStateEx = _LAN_SYSTEMSTATE_DATACHANGED_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0014 and \
         header == 0x0084
-    data = record[4:]
 
-    mainCurrent = int.from_bytes(data[0:2], byteorder = "little")
-    progCurrent = int.from_bytes(data[2:4], byteorder = "little")
-    filteredMainCurrent = int.from_bytes(data[4:6], byteorder = "little")
-    temp = int.from_bytes(data[6:8], byteorder = "little")
-    supplyVoltage = int.from_bytes(data[8:10], byteorder = "little")
-    vccVoltage = int.from_bytes(data[10:12], byteorder = "little")
-
-    csEmergencyStop = (data[12] & 0x01)
-    csTrackVoltageOff = (data[12] & 0x02)
-    csShortCircuit = (data[12] & 0x04)
-    csProgrammingModeActive = (data[12] & 0x20)
+    csEmergencyStop = (centralState & 0x01)
+    csTrackVoltageOff = (centralState & 0x02)
+    csShortCircuit = (centralState & 0x04)
+    csProgrammingModeActive = (centralState & 0x20)
     
-    cseHighTemperature = (data[13] & 0x01)
-    csePowerLost = (data[13] & 0x02)
-    cseShortCircuitExternal = (data[13] & 0x04)
-    cseShortCircuitInternal = (data[13] & 0x08)
+    cseHighTemperature = (centralStateEx & 0x01)
+    csePowerLost = (centralStateEx & 0x02)
+    cseShortCircuitExternal = (centralStateEx & 0x04)
+    cseShortCircuitInternal = (centralStateEx & 0x08)
     return \
-        { "Message": "LAN_SYSTEMSTATE_DATACHANGED",
-          "mainCurrent": mainCurrent,
-          "progCurrent": progCurrent,
-          "temp": temp,
-          "supplyVoltage": supplyVoltage,
-          "vccVoltage": vccVoltage,
-          "csEmergencyStop": csEmergencyStop,
-          "csTrackVoltageOff": csTrackVoltageOff,
-          "csShortCircuit": csShortCircuit,
-          "csProgrammingModeActive": csProgrammingModeActive,
-          "cseHighTemperature": cseHighTemperature,
-          "csePowerLost": csePowerLost,
-          "cseShortCircuitExternal": cseShortCircuitExternal,
-          "cseShortCircuitInternal": cseShortCircuitInternal } if correctRecord else \
-        { "record error" }
+        SystemState(
+            mainCurrent, progCurrent, temp, supplyVoltage, vccVoltage,
+            csEmergencyStop, csTrackVoltageOff, csShortCircuit, csProgrammingModeActive,
+            cseHighTemperature, csePowerLost, cseShortCircuitExternal, cseShortCircuitInternal) if correctRecord else \
+        RECORD_ERROR
+
+LAN_SYSTEMSTATE_GETDATA: Final[bytes] = b"\x04\x00\x85\x00" # dataLen 0x0004, header 0x0085
 
 def sendLanSystemstateGetdata(): # 2.19 LAN_SYSTEMSTATE_GETDATA
-    dataLen = 0x0004
-    header = 0x0085
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little")
+    return LAN_SYSTEMSTATE_GETDATA
+
+LAN_GET_HWINFO: Final[bytes] = b"\x04\x00\x1A\x00" # dataLen 0x0004, header 0x001A
 
 def sendLanGetHwInfo(): # 2.20 LAN_GET_HWINFO
-    dataLen = 0x0004
-    header = 0x001A
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little")
+    return LAN_GET_HWINFO
+
+_LAN_GET_HWINFO_S = struct.Struct("<HHI2B")
+_HW_TYPES = {
+    0x00000200: "D_HWT_Z21_OLD",
+    0x00000201: "D_HWT_Z21_NEW",
+    0x00000202: "D_HWT_Z21_SMARTRAIL",
+    0x00000203: "D_HWT_z21_SMALL",
+    0x00000204: "D_HWT_z21_START"
+}
+
+@dataclass(slots = True)
+class HwInfo: # 2.20 LAN_GET_HWINFO
+    message: str = field(default = "LAN_GET_HWINFO", init = False)
+    hwType: str
+    majVersion: int
+    minVersion: int
 
 def receiveLanGetHwInfo(record): # 2.20 LAN_GET_HWINFO
     if len(record) != 0x000C:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
+    dataLen, header, hwCode, db4, db5 = _LAN_GET_HWINFO_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x000C and \
         header == 0x001A
-    data = record[4:]
-    hwCode = int.from_bytes(data[0:4], byteorder = "little")
-    hwType = \
-        "D_HWT_Z21_OLD" if hwCode == 0x00000200 else \
-        "D_HWT_Z21_NEW" if hwCode == 0x00000201 else \
-        "D_HWT_Z21_SMARTRAIL" if hwCode == 0x00000202 else \
-        "D_HWT_z21_SMALL" if hwCode == 0x00000203 else \
-        "D_HWT_z21_START" if hwCode == 0x00000204 else \
-        "unknown"
-    db4H, db4L = bcdNibbles(data[4])
-    db5H, db5L = bcdNibbles(data[5])
+    hwType = _HW_TYPES.get(hwCode, "unknown")
+    db4H, db4L = _BCD[db4]
+    db5H, db5L = _BCD[db5]
     minVersion = 10 * db4H + db4L
     majVersion = 10 * db5H + db5L
     return \
-        { "Message": "LAN_GET_HWINFO",
-          "Hardware Type": hwType,
-          "Firmware Major Version": majVersion,
-          "Firmware Minor Version": minVersion } if correctRecord else \
-        { "record error" }
+        HwInfo(hwType, majVersion, minVersion) if correctRecord else \
+        RECORD_ERROR
+
+LAN_GET_CODE: Final[bytes] = b"\x04\x00\x18\x00" # dataLen 0x0004, header 0x0018
 
 def sendLanGetCode(): # 2.21 LAN_GET_CODE
-    dataLen = 0x0004
-    header = 0x0018
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little")
+    return LAN_GET_CODE
+
+_SW_TYPES = {
+    0x00: "Z21_NO_LOCK",
+    0x01: "Z21_START_LOCKED",
+    0x02: "Z21_START_UNLOCKED"
+}
+
+@dataclass(slots = True)
+class Code: # 2.21 LAN_GET_CODE
+    message: str = field(default = "LAN_GET_CODE", init = False)
+    swType: str
 
 def receiveLanGetCode(record): # 2.21 LAN_GET_CODE
     if len(record) != 0x0005:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
+    dataLen, header, swCode = _DATA8_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0005 and \
         header == 0x0018
-    data = record[4:]
-    swCode = int.from_bytes(data[0:4], byteorder = "little")
-    swType = \
-        "Z21_NO_LOCK" if swCode == 0x00 else \
-        "Z21_START_LOCKED" if swCode == 0x01 else \
-        "Z21_START_UNLOCKED" if swCode == 0x02 else \
-        "unknown"
+    swType = _SW_TYPES.get(swCode, "unknown")
     return \
-        { "Message": "LAN_GET_HWINFO",
-          "Software Feature Scope": swType } if correctRecord else \
-        { "record error" }
+        Code(swType) if correctRecord else \
+        RECORD_ERROR
+
+# One-time check at import of the XOR bytes in the precomputed X-Bus records
+if not all(verifyChecksum(record) for record in (
+        LAN_X_GET_VERSION,
+        LAN_X_GET_STATUS,
+        LAN_X_SET_TRACK_POWER_OFF,
+        LAN_X_SET_TRACK_POWER_ON,
+        LAN_X_SET_STOP,
+        LAN_X_GET_FIRMWARE_VERSION)):
+    raise ValueError("precomputed X-Bus record with incorrect XOR checksum")
+
+_LAN_X_GET_LOCO_INFO_S = struct.Struct("<HH5B")
 
 def sendLanXGetLocoInfo(address): # 4.1 LAN_X_GET_LOCO_INFO
     dataLen = 0x0009
@@ -466,15 +456,13 @@ def sendLanXGetLocoInfo(address): # 4.1 LAN_X_GET_LOCO_INFO
     db0 = 0xF0
     db1 = 0
     db2 = address
-    xor = xHeader ^ db0 ^ db1 ^ db2
-    return  \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(db1, 1, byteorder = "little") + \
-        int.to_bytes(db2, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    return _LAN_X_GET_LOCO_INFO_S.pack(
+        dataLen, header, xHeader, db0, db1, db2,
+        xHeader ^ db0 ^ db1 ^ db2)
+
+_LAN_X_SET_LOCO_DRIVE_S = struct.Struct("<HH6B")
+_STOP_SPEEDS = { "normal": 0, "emergency": 1 }
+_DIRECTION_BITS = { "forward": 0b10000000, "backward": 0b00000000 }
 
 def sendLanXSetLocoDrive(address, direction, speed, stop): # 4.2 LAN_X_SET_LOCO_DRIVE
     # Note: this function will always use 128 speed steps.
@@ -487,23 +475,14 @@ def sendLanXSetLocoDrive(address, direction, speed, stop): # 4.2 LAN_X_SET_LOCO_
     db0 = 0x13
     db1 = 0
     db2 = address
-    codingSpeed = \
-        0 if stop == "normal" or speed == 0 else \
-        1 if stop == "emergency" else \
-        speed + 1
-    db3 = \
-        codingSpeed | 0b10000000 if direction == "forward" else \
-        codingSpeed & ~0b10000000
-    xor = xHeader ^ db0 ^ db1 ^ db2 ^ db3
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(db1, 1, byteorder = "little") + \
-        int.to_bytes(db2, 1, byteorder = "little") + \
-        int.to_bytes(db3, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    codingSpeed = 0 if speed == 0 else _STOP_SPEEDS.get(stop, speed + 1)
+    db3 = codingSpeed & 0b01111111 | _DIRECTION_BITS.get(direction, 0b00000000)
+    return _LAN_X_SET_LOCO_DRIVE_S.pack(
+        dataLen, header, xHeader, db0, db1, db2, db3,
+        xHeader ^ db0 ^ db1 ^ db2 ^ db3)
+
+_LAN_X_SET_LOCO_FUNCTION_S = struct.Struct("<HH6B")
+_SWITCH_MODE_BITS = { "off": 0b00000000, "on": 0b01000000, "switch": 0b10000000 }
 
 def sendLanXSetLocoFunction(address, function, switchMode): # 4.3 LAN_X_SET_LOCO_FUNCTION
     # function: decimal, 1 - 63 (should not be more than 28)
@@ -514,161 +493,145 @@ def sendLanXSetLocoFunction(address, function, switchMode): # 4.3 LAN_X_SET_LOCO
     db0 = 0xF8
     db1 = 0
     db2 = address
-    db3 = \
-        function & ~0b11000000 if switchMode == "off" else \
-        function & ~0b10000000 | 0b01000000 if switchMode == "on" else \
-        function | 0b10000000 & ~0b01000000
-    xor = xHeader ^ db0 ^ db1 ^ db2 ^ db3
-    return  \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(db1, 1, byteorder = "little") + \
-        int.to_bytes(db2, 1, byteorder = "little") + \
-        int.to_bytes(db3, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    db3 = function & 0b00111111 | _SWITCH_MODE_BITS.get(switchMode, 0b10000000)
+    return _LAN_X_SET_LOCO_FUNCTION_S.pack(
+        dataLen, header, xHeader, db0, db1, db2, db3,
+        xHeader ^ db0 ^ db1 ^ db2 ^ db3)
+
+# Bit masks of f[0] (light) to f[28] in DB4 - DB7 of LAN_X_LOCO_INFO, read as one little endian int
+_FUNCTION_MASKS = (0x10, 0x01, 0x02, 0x04, 0x08) + tuple(0x100 << i for i in range(24))
+
+@dataclass(slots = True)
+class LocoInfo: # 4.4 LAN_X_LOCO_INFO
+    # Only the address is decoded up front, the other fields are decoded from raw on access
+    message: str = field(default = "LAN_X_LOCO_INFO", init = False)
+    address: int
+    raw: bytes # DB0 - DBn, without XOR
+
+    @property
+    def busy(self):
+        return self.raw[2] & 0b00001000 != 0
+
+    @property
+    def res(self):
+        return \
+            14 if self.raw[2] & 0b00000111 == 0 else \
+            18 if self.raw[2] & 0b00000111 == 2 else \
+            128
+
+    @property
+    def direction(self):
+        return \
+            "forward" if self.raw[3] & 0b10000000 != 0 else \
+            "backward"
+
+    @property
+    def speed(self):
+        return self.raw[3] & 0b01111111
+
+    @property
+    def doubletraction(self):
+        return self.raw[4] & 0b01000000 != 0
+
+    @property
+    def smartsearch(self):
+        return self.raw[4] & 0b00100000 != 0
+
+    @property
+    def functions(self):
+        functionBits = int.from_bytes(self.raw[4:8], byteorder = "little")
+        return [functionBits & mask != 0 for mask in _FUNCTION_MASKS]
 
 def receiveLanXLocoInfo(record): # 4.4 LAN_X_LOCO_INFO
     if len(record) < 14 or len(record) > 21: # NOT ready for future DB8 - DB14!
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
+    dataLen, header = _HDR_S.unpack_from(record)
     data = record[4:]
     xHeader = data[0]
-    xor = data[4]
+    xor = data[-1]
     correctRecord = \
-        dataLen >= 14 and dataLen >= 21 and \
+        14 <= dataLen <= 21 and \
         header == 0x0040 and \
-        xHeader == 0xEF
-    locInfo = record[5:]
+        xHeader == 0xEF and \
+        xor == xorChecksum(data[:-1])
+    locInfo = record[5:-1]
     address = int.from_bytes(locInfo[0:2], byteorder = "big")
-    busy = locInfo[2] & 0b00001000 != 0
-    res = \
-        14 if locInfo[2] & 0b00000111 == 0 else \
-        18 if locInfo[2] & 0b00000111 == 2 else \
-        128
-    direction = \
-        "forward" if locInfo[3] & 0b10000000 != 0 else \
-        "backward"
-    speed = locInfo[3] & 0b01111111
-    doubletraction = locInfo[4] & 0b01000000 != 0
-    smartsearch = locInfo[4] & 0b00100000 != 0
-    f = [
-        locInfo[4] & 0b00010000 != 0, # f[0] = light
-        locInfo[4] & 0b00000001 != 0,
-        locInfo[4] & 0b00000010 != 0,
-        locInfo[4] & 0b00000100 != 0,
-        locInfo[4] & 0b00001000 != 0,
-        locInfo[5] & 0b00000001 != 0,
-        locInfo[5] & 0b00000010 != 0,
-        locInfo[5] & 0b00000100 != 0,
-        locInfo[5] & 0b00001000 != 0,
-        locInfo[5] & 0b00010000 != 0,
-        locInfo[5] & 0b00100000 != 0,
-        locInfo[5] & 0b01000000 != 0,
-        locInfo[5] & 0b10000000 != 0,
-        locInfo[6] & 0b00000001 != 0,
-        locInfo[6] & 0b00000010 != 0,
-        locInfo[6] & 0b00000100 != 0,
-        locInfo[6] & 0b00001000 != 0,
-        locInfo[6] & 0b00010000 != 0,
-        locInfo[6] & 0b00100000 != 0,
-        locInfo[6] & 0b01000000 != 0,
-        locInfo[6] & 0b10000000 != 0,
-        locInfo[7] & 0b00000001 != 0,
-        locInfo[7] & 0b00000010 != 0,
-        locInfo[7] & 0b00000100 != 0,
-        locInfo[7] & 0b00001000 != 0,
-        locInfo[7] & 0b00010000 != 0,
-        locInfo[7] & 0b00100000 != 0,
-        locInfo[7] & 0b01000000 != 0,
-        locInfo[7] & 0b10000000 != 0 #f[28]
-        ]
     return \
-        { "Message": "LAN_X_LOCO_INFO",
-          "address": address,
-          "busy": busy,
-          "res": res,
-          "direction": direction,
-          "speed": speed,
-          "doubletraction": doubletraction,
-          "smartsearch": smartsearch,
-          "functions": f } if correctRecord else \
-        { "record error" }
+        LocoInfo(address, bytes(locInfo)) if correctRecord else \
+        RECORD_ERROR
+
+_LAN_X_GET_TURNOUT_INFO_S = struct.Struct("<HH4B")
 
 def sendLanXGetTurnoutInfo(address): # 5.1 LAN_X_GET_TURNOUT_INFO
-    if address < 1 or address > 255:
+    if not 0 < address < 256:
         return
     dataLen = 0x0008
     header = 0x0040
     xHeader = 0x43
     db0 = 0
     db1 = address - 1
-    xor = xHeader ^ db0 ^ db1
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(db1, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    return _LAN_X_GET_TURNOUT_INFO_S.pack(
+        dataLen, header, xHeader, db0, db1,
+        xHeader ^ db0 ^ db1)
+
+_LAN_X_SET_TURNOUT_S = struct.Struct("<HH5B")
+# db2: 10Q0A00P where Q = 1, A = 1, P = 0 (branched) or 1 (straight)
+_TURNOUT_POSITIONS = { "straight": 0b10101001, "branched": 0b10101000 }
 
 def sendLanXSetTurnout(address, pos): # 5.2 LAN_X_SET_TURNOUT
-    if address < 1 or address > 255:
+    if not 0 < address < 256:
         return
-    if pos != "straight" and pos != "branched":
+    if pos not in _TURNOUT_POSITIONS:
         return
     dataLen = 0x0009
     header = 0x0040
     xHeader = 0x53
     db0 = 0
     db1 = address - 1
-    # db2: 10Q0A00P where Q = 1, A = 1, P = 0 (branched) or 1 (straight)
-    db2 = 0b10101000 if pos == "branched" else 0b10101001
-    xor = xHeader ^ db0 ^ db1 ^ db2
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(xHeader, 1, byteorder = "little") + \
-        int.to_bytes(db0, 1, byteorder = "little") + \
-        int.to_bytes(db1, 1, byteorder = "little") + \
-        int.to_bytes(db2, 1, byteorder = "little") + \
-        int.to_bytes(xor, 1, byteorder = "little")
+    db2 = _TURNOUT_POSITIONS[pos]
+    return _LAN_X_SET_TURNOUT_S.pack(
+        dataLen, header, xHeader, db0, db1, db2,
+        xHeader ^ db0 ^ db1 ^ db2)
+
+_TURNOUT_STATES = {
+    0: "not set",
+    1: "branched",
+    2: "straight"
+}
+
+@dataclass(slots = True)
+class TurnoutInfo: # 5.3 LAN_X_TURNOUT_INFO
+    message: str = field(default = "LAN_X_TURNOUT_INFO", init = False)
+    address: int
+    status: str
 
 def receiveLanXTurnoutInfo(record): # 5.3 LAN_X_TURNOUT_INFO
     if len(record) != 0x0009:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:4], byteorder = "little")
-    data = record[4:]
-    xHeader = data[0]
-    db0 = data[1]
-    db1 = data[2]
-    db2 = data[3]
-    xor = data[4]
+    dataLen, header, xHeader, db0, db1, db2, xor = _X_DB2_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x0009 and \
         header == 0x0040 and \
         xHeader == 0x43 and \
         xor == xHeader ^ db0 ^ db1 ^ db2
-    db = record[5:]
-    address = int.from_bytes(db[0:2], byteorder = "big") + 1
-    status = \
-        "not set" if db[2] == 0 else \
-        "branched" if db[2] == 1 else \
-        "straight" if db[2] == 2 else \
-        "error"
+    address = (db0 << 8 | db1) + 1
+    status = _TURNOUT_STATES.get(db2, "error")
     return \
-        { "address": address,
-          "status": status } if correctRecord else \
-        { "record error" }
+        TurnoutInfo(address, status) if correctRecord else \
+        RECORD_ERROR
+
+@dataclass(slots = True)
+class RmbusData: # 7.1 LAN_RMBUS_DATACHANGED
+    message: str = field(default = "LAN_RMBUS_DATACHANGED", init = False)
+    groupIndex: int
+    module1: tuple
+    module2: tuple
+    feedback: int
 
 def receiveLanRmbusDatachanged(record): # 7.1 LAN_RMBUS_DATACHANGED
     if len(record) != 0x000F:
         return
-    dataLen = int.from_bytes(record[0:2], byteorder = "little")
-    header = int.from_bytes(record[2:2], byteorder = "little")
+    dataLen, header = _HDR_S.unpack_from(record)
     correctRecord = \
         dataLen == 0x000F and \
         header == 0x0080
@@ -676,86 +639,102 @@ def receiveLanRmbusDatachanged(record): # 7.1 LAN_RMBUS_DATACHANGED
     groupIndex = data[0]
     feedbackStatus = data[1:]
     
-    # Implemented for feedback modules 1 and 2
-    fm1 = [
-        feedbackStatus[0] & 0b00000001, # channel 1
-        feedbackStatus[0] & 0b00000010,
-        feedbackStatus[0] & 0b00000100,
-        feedbackStatus[0] & 0b00001000,
-        feedbackStatus[0] & 0b00010000,
-        feedbackStatus[0] & 0b00100000,
-        feedbackStatus[0] & 0b01000000,
-        feedbackStatus[0] & 0b10000000 # channel 8
-    ]
-    fm2 = [
-        feedbackStatus[1] & 0b00000001,
-        feedbackStatus[1] & 0b00000010,
-        feedbackStatus[1] & 0b00000100,
-        feedbackStatus[1] & 0b00001000,
-        feedbackStatus[1] & 0b00010000,
-        feedbackStatus[1] & 0b00100000,
-        feedbackStatus[1] & 0b01000000,
-        feedbackStatus[1] & 0b10000000
-    ]
-    # This pattern can be extended to feedback module 10
+    # Implemented for feedback modules 1 and 2, channel 1 is the lowest bit
+    fm1 = tuple(feedbackStatus[0] >> channel & 1 for channel in range(8))
+    fm2 = tuple(feedbackStatus[1] >> channel & 1 for channel in range(8))
+    # All 10 modules: channel c of module m is bit 8 * (m - 1) + (c - 1)
+    feedbackBits = int.from_bytes(feedbackStatus, byteorder = "little")
     
     return \
-        { "groupIndex": groupIndex,
-          "module 1": fm1,
-          "module 2": fm2 } if correctRecord else \
-        { "record error" }
+        RmbusData(groupIndex, fm1, fm2, feedbackBits) if correctRecord else \
+        RECORD_ERROR
+
+_LAN_RMBUS_GETDATA_S = struct.Struct("<HHB")
 
 def sendLanRmbusGetdata(groupIndex): # 7.2 LAN_RMBUS_GETDATA
-    if groupIndex < 1 or groupIndex > 2:
+    if not 0 < groupIndex < 3:
         return
     dataLen = 0x0005
     header = 0x0081
-    return \
-        int.to_bytes(dataLen, 2, byteorder = "little") + \
-        int.to_bytes(header, 2, byteorder = "little") + \
-        int.to_bytes(groupIndex, 1, byteorder = "little")
+    return _LAN_RMBUS_GETDATA_S.pack(dataLen, header, groupIndex)
+
+# Ends the records of a packet whose length bytes do not add up; dispatch passes it through
+EXTRACT_RECORDS_ERROR = "extractRecords error"
+
+def iterRecords(packet): # zero-copy views on the records in packet, in a single pass
+    buffer = memoryview(packet)
+    packetLen = len(buffer)
+    offset = 0
+    while offset < packetLen:
+        recordLen = buffer[offset]
+        if recordLen == 0 or offset + recordLen > packetLen:
+            yield EXTRACT_RECORDS_ERROR
+            return
+        yield buffer[offset:offset + recordLen]
+        offset += recordLen
 
 def extractRecords(packet):
-    return \
-        [ ] if len(packet) == 0 else \
-        [ "extractRecords error" ] if len(packet) < packet[0] else \
-        [ packet[0:packet[0] ] ] + extractRecords(packet[packet[0]:])
+    return [
+        EXTRACT_RECORDS_ERROR if record is EXTRACT_RECORDS_ERROR else bytes(record)
+        for record in iterRecords(packet) ]
+
+_DISPATCH_LAN_X_S = struct.Struct("<4xB") # X-Header
+_DISPATCH_LAN_X_TABLE = {
+    0x43: receiveLanXTurnoutInfo,
+    0x61: receiveLanXBc,
+    0x62: receiveLanXStatusChanged,
+    0x63: receiveLanXGetVersion,
+    0x81: receiveLanXBcStopped,
+    0xEF: receiveLanXLocoInfo,
+    0xF3: receiveLanXGetFirmwareVersion
+}
 
 def dispatchLanX(record):
-    dispatchTable = {
-        0x43: receiveLanXTurnoutInfo,
-        0x61: receiveLanXBc,
-        0x62: receiveLanXStatusChanged,
-	0x63: receiveLanXGetVersion,
-        0x81: receiveLanXBcStopped,
-        0xEF: receiveLanXLocoInfo,
-        0xF3: receiveLanXGetFirmwareVersion
-    }
-    header = int.from_bytes(record[4:5], byteorder = "little")
-    return \
-	"" if len(record) == 0 else \
-	dispatchTable[header](record) if header in dispatchTable else \
-	"dispatchLanX error"
+    if len(record) < 5:
+        return "dispatchLanX error"
+    (xHeader,) = _DISPATCH_LAN_X_S.unpack_from(record)
+    receive = _DISPATCH_LAN_X_TABLE.get(xHeader)
+    return \
+        receive(record) if receive else \
+        "dispatchLanX error"
+
+_DISPATCH_S = struct.Struct("<2xH") # header
+_DISPATCH_TABLE = {
+    0x0010: receiveLanGetSerialNumber,
+    0x0018: receiveLanGetCode,
+    0x001A: receiveLanGetHwInfo,
+    0x0040: dispatchLanX,
+    0x0051: receiveLanGetBroadcastflags,
+    0x0080: receiveLanRmbusDatachanged,
+    0x0084: receiveLanSystemstateDatachanged
+}
+
+def _receiverFor(record): # record of at least 4 bytes; None for an unknown header
+    (header,) = _DISPATCH_S.unpack_from(record)
+    receive = _DISPATCH_TABLE.get(header)
+    if receive is dispatchLanX and len(record) >= 5:
+        # X-Bus records go straight to their handler, skipping dispatchLanX
+        (xHeader,) = _DISPATCH_LAN_X_S.unpack_from(record)
+        receive = _DISPATCH_LAN_X_TABLE.get(xHeader, dispatchLanX)
+    return receive
 
 def dispatch(record):
-    dispatchTable = {
-	0x0010: receiveLanGetSerialNumber,
-        0x0018: receiveLanGetCode,
-        0x001A: receiveLanGetHwInfo,
-        0x0040: dispatchLanX,
-        0x0051: receiveLanGetBroadcastflags,
-        0x0080: receiveLanRmbusDatachanged,
-        0x0084: receiveLanSystemstateDatachanged
-    }
-    header = int.from_bytes(record[2:4], byteorder = "little")
+    if record is EXTRACT_RECORDS_ERROR:
+        return record
+    if len(record) < 4:
+        return "" if len(record) == 0 else "dispatch error"
+    receive = _receiverFor(record)
+    # Records are passed on as a memoryview, so slicing them in the handlers does not copy
     return \
-	"" if len(record) == 0 else \
-	dispatchTable[header](record) if header in dispatchTable else \
-	"dispatch error"
-	
+        receive(memoryview(record)) if receive else \
+        "dispatch error"
+
 def multiDispatch(recordArray):
     return [dispatch(record) for record in recordArray]
 
+def parsePacket(packet): # extractRecords and multiDispatch in a single pass, without copying records
+    return multiDispatch(iterRecords(packet))
+
 Z21 = ('192.168.0.111', 21105)
 
 # How to use library:
@@ -767,12 +746,17 @@ Z21 = ('192.168.0.111', 21105)
 # connect to command station:
 # s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) # Internet, UDP
 
-# send a command:
+# send a fixed command, preferably through its precomputed record:
+# s.sendto(LAN_SET_BROADCASTFLAGS, Z21)
+# or through its function, which returns the same record:
 # s.sendto(sendLanSetBroadcastflags(), Z21)
 
+# send a command with parameters:
+# s.sendto(sendLanXSetLocoDrive(3, "forward", 40, "none"), Z21)
+
 # receive records:
 # packet, sender = s.recvfrom(1024)
-# print(multiDispatch(extractRecords(packet)) if sender == Z21 else "unknown sender")
+# print(parsePacket(packet) if sender == Z21 else "unknown sender")
 
 # disconnect:
 # s.close();